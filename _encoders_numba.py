@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+"""
+Numba-compiled kernels for the batch encoders
+
+Importing this module requires numba; enhanced_compression falls back to the
+NumPy implementation when it is not installed.
+"""
+
+from numba import njit, prange
+
+@njit(parallel=True, cache=True, fastmath=False)
+def encode_batch(vals, base, chars, out, lengths):
+    """
+    Base-N encode each value into a row of a preallocated output array.
+    Digits are right-aligned in each row; lengths receives the digit count.
+
+    Args:
+        vals (ndarray): int64 values to encode; zero and negatives encode as "0"
+        base (int): Target base, must equal len(chars)
+        chars (ndarray): uint8 alphabet
+        out (ndarray): uint8 array of shape (len(vals), max_digits)
+        lengths (ndarray): int64 array of len(vals)
+    """
+    k = out.shape[1]
+    for i in prange(vals.shape[0]):
+        n = vals[i]
+        if n <= 0:
+            out[i, k - 1] = chars[0]
+            lengths[i] = 1
+            continue
+
+        j = k
+        while n > 0:
+            j -= 1
+            out[i, j] = chars[n % base]
+            n //= base
+        lengths[i] = k - j
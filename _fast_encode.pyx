@@ -0,0 +1,55 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+
+"""
+Compiled base-N encoders
+
+Build in place with `python setup.py build_ext --inplace`. time_converter and
+enhanced_compression use these kernels when the extension is importable and
+fall back to their pure-Python encoders otherwise.
+"""
+
+cdef bytes _CHARS36 = b"0123456789abcdefghijklmnopqrstuvwxyz"
+cdef bytes _CHARS62 = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+cdef bytes _CHARS94 = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ!#$%&()*+,-./:;<=>?@[]^_{|}~"
+
+cdef str _encode_big(object number, bytes alphabet):
+    """Encode values beyond 64 bits with Python integers."""
+    base = len(alphabet)
+    digits = []
+    while number:
+        number, digit = divmod(number, base)
+        digits.append(chr(alphabet[digit]))
+    return "".join(reversed(digits))
+
+cdef str _encode(object millis, bytes alphabet):
+    """Encode a non-negative integer, writing digits right-to-left into a stack buffer."""
+    cdef const char* chars = alphabet
+    cdef unsigned long long base = len(alphabet)
+    cdef unsigned long long n
+    cdef char buf[64]
+    cdef int i = 64
+
+    if millis <= 0:
+        return "0"
+    if millis > 0xFFFFFFFFFFFFFFFF:
+        return _encode_big(millis, alphabet)
+
+    n = millis
+    while n:
+        i -= 1
+        buf[i] = chars[n % base]
+        n //= base
+
+    return buf[i:64].decode('ascii')
+
+def encode_base36(millis):
+    """Base36 (0-9, a-z) encoding, same output as compress_millis_custom."""
+    return _encode(millis, _CHARS36)
+
+def encode_base62(millis):
+    """Base62 (0-9, a-z, A-Z) encoding, same output as compress_millis_base62."""
+    return _encode(millis, _CHARS62)
+
+def encode_base94(millis):
+    """Base94 alphabet encoding, same output as compress_millis_base94."""
+    return _encode(millis, _CHARS94)
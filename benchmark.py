@@ -10,69 +10,121 @@ and reports on their efficiency, size, and performance.
 import sys
 import time
 import json
+import argparse
 import struct
 import base64
-from datetime import datetime, timedelta
-import time as timer
+from datetime import datetime, timedelta, timezone
+from timeit import Timer
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; results are written with the json module instead
+    orjson = None
 
 # Import compression methods
 from time_converter import compress_millis_base64, compress_millis_custom, compress_millis_base62, compress_split_days_time
 from enhanced_compression import compress_millis_base94, compress_millis_variable, compress_millis_bit_packed
+from enhanced_compression import compress_millis_base64url
+from enhanced_compression import (
+    compress_millis_bit_packed_batch,
+    compress_millis_base64url_batch,
+    compress_split_days_time_batch,
+    compress_millis_base36_batch,
+    compress_millis_base62_batch,
+    compress_millis_base94_batch,
+    compress_millis_variable_batch
+)
+
+def utc_millis(year, month, day):
+    """Milliseconds since epoch for midnight UTC on the given date (matches JS Date parsing)."""
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
 
 def generate_test_timestamps():
-    """Generate a range of test timestamps."""
-    timestamps = []
-
+    """Generate a range of test timestamps as an int64 array."""
     # Current time
     current_time = int(time.time() * 1000)
-    timestamps.append(current_time)
-
-    # Recent timestamps (past week)
-    timestamps.append(current_time - 1000 * 60 * 60 * 24 * 1)  # 1 day ago
-    timestamps.append(current_time - 1000 * 60 * 60 * 24 * 7)  # 1 week ago
-
-    # Timestamps from different periods
-    timestamps.append(int(datetime(2020, 1, 1).timestamp() * 1000))  # Beginning of 2020
-    timestamps.append(int(datetime(2000, 1, 1).timestamp() * 1000))  # Y2K
-    timestamps.append(int(datetime(1980, 1, 1).timestamp() * 1000))  # 1980
-    timestamps.append(int(datetime(1970, 1, 1).timestamp() * 1000) + 100000)  # Just after epoch
-
-    # Future timestamps
-    timestamps.append(current_time + 1000 * 60 * 60 * 24 * 365)  # 1 year in future
-
-    # Very large timestamp - Python can handle even larger ones than JS
-    timestamps.append(8640000000000000)  # Max date - JavaScript limit
 
-    # 20 timestamps per day during a period of 60 days starting from 2023-01-01
-    start = int(datetime(2023, 1, 1).timestamp() * 1000)
-    for i in range(60 * 20):
-        timestamps.append(int(start + i * (60 * 24 * 60 * 60 * 1000) / (60 * 20)))  # Spread over 60 days
+    fixed = np.array([
+        current_time,
+        # Recent timestamps (past week)
+        current_time - 1000 * 60 * 60 * 24 * 1,  # 1 day ago
+        current_time - 1000 * 60 * 60 * 24 * 7,  # 1 week ago
+        # Timestamps from different periods
+        utc_millis(2020, 1, 1),  # Beginning of 2020
+        utc_millis(2000, 1, 1),  # Y2K
+        utc_millis(1980, 1, 1),  # 1980
+        utc_millis(1970, 1, 1) + 100000,  # Just after epoch
+        # Future timestamps
+        current_time + 1000 * 60 * 60 * 24 * 365,  # 1 year in future
+        # Very large timestamp - Python can handle even larger ones than JS
+        8640000000000000  # Max date - JavaScript limit
+    ], dtype=np.int64)
+
+    # 20 timestamps per day during a period of 60 days starting from 2023-01-01,
+    # with an integer step so no entry goes through float rounding
+    start = utc_millis(2023, 1, 1)
+    step_ms = 60 * 24 * 60 * 60 * 1000 // (60 * 20)
+    series = start + np.arange(60 * 20, dtype=np.int64) * step_ms
+
+    return np.concatenate([fixed, series])
+
+def make_example(timestamp, compressed, time_taken):
+    """Build an example entry for the results file."""
+    try:
+        dt = datetime.fromtimestamp(timestamp/1000).isoformat()
+    except (ValueError, OverflowError):
+        dt = "Date too large for Python datetime"
 
-    return timestamps
-
-def get_size_info(original, representation):
-    """Calculate size information about a representation."""
-    original_bytes = len(str(original))
-    representation_bytes = len(representation)
-    saving = original_bytes - representation_bytes
-    saving_percent = (saving / original_bytes) * 100 if original_bytes > 0 else 0
+    return {
+        "timestamp": timestamp,
+        "timestamp_iso": dt,
+        "compressed": compressed,
+        "size": len(compressed),
+        "timeTaken": f"{time_taken:.3f}"
+    }
 
-    if saving >= 0:
-        efficiency = f"Saved {saving} chars ({saving_percent:.2f}%)"
+def save_results(results, path):
+    """Write the results as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+def uncached(func):
+    """Return the underlying encoder so timings reflect the algorithm, not cache hits."""
+    return getattr(func, "__wrapped__", func)
+
+def time_method(method, timestamps, repeat=5):
+    """
+    Time a method over the whole timestamp array with timeit.
+    Uses the batch form when the method has one.
+
+    Returns:
+        float: Best per-timestamp time in seconds across the repeats
+    """
+    if "batch" in method:
+        batch = method["batch"]
+        bench = Timer(lambda: batch(timestamps))
     else:
-        efficiency = f"Increased by {abs(saving)} chars ({abs(saving_percent):.2f}%)"
+        # Scalar encoders get plain Python ints, as real callers would pass
+        func = uncached(method["func"])
+        values = timestamps.tolist()
+        bench = Timer(lambda: [func(timestamp) for timestamp in values])
 
-    return {
-        "original_size": original_bytes,
-        "representation_size": representation_bytes,
-        "efficiency": efficiency,
-        "saving_percent": saving_percent
-    }
+    return min(bench.repeat(repeat, 1)) / len(timestamps)
+
+def run_benchmark(iterations=1):
+    """
+    Run benchmark for all methods and output results.
 
-def run_benchmark():
-    """Run benchmark for all methods and output results."""
+    Args:
+        iterations (int): Number of timing rounds; the best round is reported
+    """
     timestamps = generate_test_timestamps()
-    results = {}
 
     print(f"Running Python benchmark on {len(timestamps)} timestamps...")
     print("-" * 80)
@@ -80,95 +132,122 @@ def run_benchmark():
     # Define methods to test
     methods = [
         {"name": "Base64", "func": compress_millis_base64},
-        {"name": "Base36", "func": compress_millis_custom},
-        {"name": "Base62", "func": compress_millis_base62},
-        {"name": "Split Base62", "func": compress_split_days_time},
-        {"name": "Base94", "func": compress_millis_base94},
-        {"name": "Variable", "func": compress_millis_variable},
-        {"name": "BitPacked", "func": compress_millis_bit_packed}
+        {"name": "Base36", "func": compress_millis_custom, "batch": compress_millis_base36_batch},
+        {"name": "Base62", "func": compress_millis_base62, "batch": compress_millis_base62_batch},
+        {"name": "Split Base62", "func": compress_split_days_time, "batch": compress_split_days_time_batch},
+        {"name": "Base94", "func": compress_millis_base94, "batch": compress_millis_base94_batch},
+        {"name": "Variable", "func": compress_millis_variable, "batch": compress_millis_variable_batch},
+        {"name": "BitPacked", "func": compress_millis_bit_packed, "batch": compress_millis_bit_packed_batch},
+        {"name": "Base64url", "func": compress_millis_base64url, "batch": compress_millis_base64url_batch}
     ]
 
-    # Initialize results
-    for method in methods:
-        results[method["name"]] = {
-            "totalSavingPercent": 0,
-            "avgSize": 0,
-            "totalSize": 0,
-            "totalTime": 0,
-            "avgTime": 0,
-            "examples": []
-        }
+    # Per-method totals, kept as parallel arrays indexed by method position
+    method_count = len(methods)
+    total_size = np.zeros(method_count, dtype=np.int64)
+    total_saving_percent = np.zeros(method_count)
+    valid_count = np.zeros(method_count, dtype=np.int64)
+    examples = [[] for _ in methods]
 
-    # Process each timestamp
-    print(f"Processing {len(timestamps)} timestamps...")
-    print(f"[0%", end="", flush=True)
+    # Original sizes are the same for every method, so compute them once
+    timestamp_list = timestamps.tolist()
+    original_sizes = np.array([len(str(timestamp)) for timestamp in timestamp_list])
 
-    for i, timestamp in enumerate(timestamps):
-        # Show progress every 10%
-        if (i + 1) % max(1, len(timestamps) // 10) == 0:
-            progress = (i + 1) / len(timestamps) * 100
-            print(f"...{progress:.0f}%", end="", flush=True)
+    # Process every method over the full timestamp set
+    print(f"Processing {len(timestamps)} timestamps...")
 
-        # For each method, run the compression and store results
-        for method in methods:
-            try:
-                start_time = timer.time()
-                compressed = method["func"](timestamp)
-                end_time = timer.time()
-
-                time_taken = (end_time - start_time) * 1000  # Convert to milliseconds
-                info = get_size_info(timestamp, compressed)
-
-                results[method["name"]]["totalSavingPercent"] += info["saving_percent"]
-                results[method["name"]]["totalSize"] += info["representation_size"]
-                results[method["name"]]["totalTime"] += time_taken
-
-                # Store example (only for first few timestamps)
-                if i < 3:
-                    try:
-                        dt = datetime.fromtimestamp(timestamp/1000).isoformat()
-                    except (ValueError, OverflowError):
-                        dt = "Date too large for Python datetime"
-
-                    results[method["name"]]["examples"].append({
-                        "timestamp": timestamp,
-                        "timestamp_iso": dt,
-                        "compressed": compressed,
-                        "size": info["representation_size"],
-                        "timeTaken": f"{time_taken:.3f}"
-                    })
-            except Exception as e:
-                # If a method fails, we still want to continue with other methods
-                pass
-
-    print(f"...100%]")
-    print("-" * 80)    # Calculate averages
-    for method_name in results:
-        results[method_name]["avgSavingPercent"] = results[method_name]["totalSavingPercent"] / len(timestamps)
-        results[method_name]["avgSize"] = results[method_name]["totalSize"] / len(timestamps)
-        results[method_name]["avgTime"] = results[method_name]["totalTime"] / len(timestamps)
-
-    # Print summary
-    print("\nSUMMARY OF RESULTS")
-    print("=" * 80)
-    print("Method".ljust(15) + "Avg Size".ljust(15) + "Avg Saving %".ljust(15) + "Avg Time (ms)".ljust(15))
+    # Progress is redrawn in place between methods, never while a method is timed,
+    # and only on a terminal so redirected output is not filled with updates
+    show_progress = sys.stdout.isatty()
+
+    # Encoded outputs are identical on every iteration, so each method is encoded
+    # (and its size stats gathered) once; later iterations only re-time it
+    encoded_cache = {}
+    best_time = np.full(method_count, np.inf)
+
+    for iteration in range(iterations):
+        for mi, method in enumerate(methods):
+            if show_progress:
+                label = f"[{mi + 1}/{method_count}] {method['name']}"
+                if iterations > 1:
+                    label += f" (iteration {iteration + 1}/{iterations})"
+                print(f"\r{label}".ljust(60), end="", flush=True)
+
+            if mi not in encoded_cache:
+                # First pass collects the outputs for the size stats (and warms up any JIT)
+                if "batch" in method:
+                    encoded = method["batch"](timestamps)
+                else:
+                    func = uncached(method["func"])
+                    encoded = [func(timestamp) for timestamp in timestamp_list]
+                encoded_cache[mi] = encoded
+
+                # Timestamps the method cannot represent (None) are skipped
+                sizes = np.array([len(compressed) if compressed is not None else 0 for compressed in encoded])
+                valid = np.array([compressed is not None for compressed in encoded])
+                saving_percent = (original_sizes - sizes) / original_sizes * 100
+
+                total_size[mi] = sizes[valid].sum()
+                total_saving_percent[mi] = saving_percent[valid].sum()
+                valid_count[mi] = valid.sum()
+
+            # Timing is a separate pass so the stats bookkeeping is not measured
+            time_taken = time_method(method, timestamps) * 1000  # Convert to milliseconds
+            best_time[mi] = min(best_time[mi], time_taken)
+
+    total_time = best_time * len(timestamps)
+
+    # Store example (only for first few timestamps)
+    for mi in range(method_count):
+        encoded = encoded_cache[mi]
+        for i in range(min(3, len(timestamps))):
+            if encoded[i] is not None:
+                examples[mi].append(make_example(timestamp_list[i], encoded[i], best_time[mi]))
+
+    if show_progress:
+        print("\r" + " " * 60, end="\r")
+    print(f"Done: {method_count} methods")
     print("-" * 80)
 
+    # Materialize the reporting dict once, with averages. Size averages are taken
+    # over the rows a method could encode, so skipped rows do not shrink them
+    results = {}
+    for mi, method in enumerate(methods):
+        encoded_rows = max(int(valid_count[mi]), 1)
+        results[method["name"]] = {
+            "totalSavingPercent": float(total_saving_percent[mi]),
+            "avgSize": float(total_size[mi]) / encoded_rows,
+            "totalSize": int(total_size[mi]),
+            "totalTime": float(total_time[mi]),
+            "avgTime": float(total_time[mi]) / len(timestamps),
+            "examples": examples[mi],
+            "avgSavingPercent": float(total_saving_percent[mi]) / encoded_rows,
+            "skipped": len(timestamps) - int(valid_count[mi])
+        }
+
+    # Build the summary and write it in one go
+    lines = [
+        "\nSUMMARY OF RESULTS",
+        "=" * 80,
+        "Method".ljust(15) + "Avg Size".ljust(15) + "Avg Saving %".ljust(15) + "Avg Time (ms)".ljust(15) + "Skipped",
+        "-" * 80
+    ]
+
     # Sort methods by average size (most efficient first)
     sorted_methods = sorted(results.keys(), key=lambda m: results[m]["avgSize"])
 
     for method in sorted_methods:
-        print(
+        lines.append(
             method.ljust(15) +
             f"{results[method]['avgSize']:.2f}".ljust(15) +
             f"{results[method]['avgSavingPercent']:.2f}".ljust(15) + "%" +
-            f"{results[method]['avgTime']:.3f}".ljust(15)
+            f"{results[method]['avgTime']:.3f}".ljust(15) +
+            str(results[method]["skipped"])
         )
 
-    # Print example compressions for the first timestamp
+    # Example compressions for the first timestamp
     if any(len(results[m]["examples"]) > 0 for m in results):
-        print("\nEXAMPLE COMPRESSIONS (first timestamp)")
-        print("=" * 80)
+        lines.append("\nEXAMPLE COMPRESSIONS (first timestamp)")
+        lines.append("=" * 80)
         first_method = sorted_methods[0]
         if results[first_method]["examples"]:
             example = results[first_method]["examples"][0]
@@ -177,17 +256,25 @@ def run_benchmark():
                 ts_iso = example.get("timestamp_iso") or datetime.fromtimestamp(timestamp/1000).isoformat()
             except (ValueError, OverflowError):
                 ts_iso = "Date too large"
-            print(f"Timestamp: {timestamp} ({ts_iso})")
-            print("-" * 80)
+            lines.append(f"Timestamp: {timestamp} ({ts_iso})")
+            lines.append("-" * 80)
             for method in sorted_methods:
                 if results[method]["examples"]:
                     ex = results[method]["examples"][0]
-                    print(f"{method.ljust(15)}: {ex['compressed'].ljust(20)} ({ex['size']} chars, {ex['timeTaken']}ms)")
-            print("-" * 80)
+                    lines.append(f"{method.ljust(15)}: {ex['compressed'].ljust(20)} ({ex['size']} chars, {ex['timeTaken']}ms)")
+            lines.append("-" * 80)
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Save results to JSON file for comparison
-    with open('python_benchmark_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    save_results(results, 'python_benchmark_results.json')
 
 if __name__ == "__main__":
-    run_benchmark()
+    parser = argparse.ArgumentParser(description="Benchmark the Python timestamp compression methods.")
+    parser.add_argument("--iterations", type=int, default=1,
+                        help="number of timing rounds; the best round is reported (default: 1)")
+    args = parser.parse_args()
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+
+    run_benchmark(args.iterations)
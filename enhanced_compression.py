@@ -7,11 +7,57 @@ This module contains additional timestamp compression methods that provide
 greater compression than the standard implementations.
 """
 
-import base64
-import struct
+import binascii
+from functools import lru_cache
+from struct import Struct, error as struct_error
 from datetime import datetime, timedelta
 
-def compress_millis_base94(millis):
+from time_converter import compress_split_days_time, make_base_encoder
+
+try:
+    import _fast_encode
+except ImportError:  # Extension not built; the pure-Python encoders below are used
+    _fast_encode = None
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch helpers fall back to the scalar encoders
+    np = None
+
+
+# Alphabets for the base-N encoders, as bytes so indexing yields the byte value
+_CHARS36 = b"0123456789abcdefghijklmnopqrstuvwxyz"
+_CHARS62 = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# The "Base94" alphabet holds 90 characters; encoders always use len() as the base
+_CHARS94 = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ!#$%&()*+,-./:;<=>?@[]^_{|}~"
+
+_DIGITS62 = _CHARS62.decode('ascii')
+
+# ASCII byte -> base62 digit value, 0xFF for bytes outside the alphabet
+_INV62 = bytes(_CHARS62.index(b) if b in _CHARS62 else 0xFF for b in range(256))
+_INV62_ARR = np.frombuffer(_INV62, dtype=np.uint8) if np is not None else None
+
+# int64 limits, and the 11 base62 digits of the maximum for the vectorized range check
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_INT64_MAX_DIGITS62 = [_INV62[b] for b in b"aZl8N0y58M7"]
+
+# URL-safe base64 alphabet for the fixed-width 42-bit encoder, plus every 12-bit pair
+_B64URL = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_DIGITS64 = _B64URL.decode('ascii')
+_PAIRS64 = [a + b for a in _DIGITS64 for b in _DIGITS64]
+_MAX_42BIT = (1 << 42) - 1
+
+# Precompiled packer for the bit-packed layout (16-bit days, 32-bit ms in day)
+_PACK_HI = Struct('>HI').pack
+_MS_PER_DAY = 24 * 60 * 60 * 1000
+
+# Encoders are pure functions of the timestamp, so repeated values are memoized.
+# The uncached implementation stays reachable as <encoder>.__wrapped__.
+_CACHE_SIZE = 4096
+
+compress_millis_base94 = lru_cache(maxsize=_CACHE_SIZE)(make_base_encoder(
+    "compress_millis_base94", _CHARS94.decode('ascii'),
     """
     Compress milliseconds into a Base94 string using nearly all printable ASCII characters.
     This provides the highest density for printable ASCII, but may be less compatible
@@ -22,21 +68,22 @@ def compress_millis_base94(millis):
 
     Returns:
         str: Base94 encoded string
-    """
-    # Use 94 printable ASCII characters (excluding space, ", ', \, and `)
-    chars = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ!#$%&()*+,-./:;<=>?@[]^_{|}~"
-    base = len(chars)  # 94
-
-    # Convert to Base94
-    result = ""
-    number = millis
-
-    while number > 0:
-        result = chars[number % base] + result
-        number //= base
-
-    return result or "0"
-
+    """,
+    module=__name__
+))
+
+# Swap in the compiled kernel when the extension has been built
+if _fast_encode is not None:
+    compress_millis_base94 = lru_cache(maxsize=_CACHE_SIZE)(_fast_encode.encode_base94)
+
+# Uncached base62 encoder shared by the variable-length and series encoders
+_encode_base62 = make_base_encoder(
+    "_encode_base62", _DIGITS62,
+    """Base62-encode a non-negative integer, two digits per iteration.""",
+    module=__name__
+)
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def compress_millis_variable(millis, reference_date=1577836800000):  # Jan 1, 2020
     """
     Variable-length encoding for timestamps.
@@ -54,25 +101,11 @@ def compress_millis_variable(millis, reference_date=1577836800000):  # Jan 1, 20
 
     # Encode sign
     sign = '+' if diff >= 0 else '-'
-    abs_diff = abs(diff)
-
-    # Use Base62 for the absolute difference
-    chars = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    base = len(chars)  # 62
-
-    result = ""
-    number = abs_diff
-
-    while number > 0:
-        result = chars[number % base] + result
-        number //= base
 
-    if not result:
-        result = "0"
-
-    # Return sign + encoded absolute difference
-    return sign + result
+    # Return sign + Base62-encoded absolute difference
+    return sign + _encode_base62(abs(diff))
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def compress_millis_bit_packed(millis):
     """
     Efficient bit-packed encoding for timestamps.
@@ -86,65 +119,386 @@ def compress_millis_bit_packed(millis):
         str: Base64 encoded string of the bit-packed value
     """
     # Split into days and milliseconds
-    MS_PER_DAY = 24 * 60 * 60 * 1000
-    days = millis // MS_PER_DAY
-    ms_in_day = millis % MS_PER_DAY
+    days, ms_in_day = divmod(millis, _MS_PER_DAY)
+
+    # Days take 2 bytes (16 bits) - supports ~179 years from epoch
+    # ms_in_day takes 4 bytes (32 bits) - only need 27 bits but using full 4 bytes for simplicity
+    return binascii.b2a_base64(_PACK_HI(days, ms_in_day), newline=False).decode('ascii')
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def compress_millis_base64url(millis):
+    """
+    Fixed-width base64url encoding for 42-bit timestamps (enough through year 2109).
+    The output is always exactly 7 URL-safe characters, the first 7 of
+    urlsafe_b64encode of the value left-aligned in 64 bits. Three 12-bit slices
+    come from a pair table and the top 6 bits from the alphabet. This is a format
+    choice, not a speedup: it runs somewhat slower than compress_millis_base64.
 
-    # Pack days into 2 bytes (16 bits) - supports ~179 years from epoch
-    days_bytes = struct.pack('>H', days)
+    Args:
+        millis (int): Milliseconds since epoch, 0 <= millis < 2**42
 
-    # Pack ms_in_day into 4 bytes (32 bits) - only need 27 bits but using full 4 bytes for simplicity
-    ms_bytes = struct.pack('>I', ms_in_day)
+    Returns:
+        str: 7-character base64url string
+    """
+    if not 0 <= millis <= _MAX_42BIT:
+        raise ValueError("timestamp does not fit in 42 bits")
 
-    # Combine and convert to base64
-    combined = days_bytes + ms_bytes
-    return base64.b64encode(combined).decode('ascii')
+    return (_DIGITS64[millis >> 36] + _PAIRS64[(millis >> 24) & 0xFFF] +
+            _PAIRS64[(millis >> 12) & 0xFFF] + _PAIRS64[millis & 0xFFF])
 
-def compress_timestamp_series(timestamps):
+def compress_timestamp_series(timestamps, dod=False):
     """
     Delta encoding for a series of timestamps.
     First timestamp is encoded fully, subsequent ones as differences.
 
+    With dod=True each entry stores the change from the previous delta instead
+    (delta-of-delta), so evenly spaced runs collapse to "+0" per timestamp.
+
     Args:
         timestamps (list): Array of millisecond timestamps
+        dod (bool): Encode delta-of-delta values instead of plain deltas
 
     Returns:
         str: Encoded string with deltas
     """
-    if not timestamps:
+    if len(timestamps) == 0:
         return ''
 
-    chars = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    base = len(chars)  # 62
-
-    # Helper function for Base62 encoding
-    def compress_base62(value):
-        result = ""
-        number = value
-
-        while number > 0:
-            result = chars[number % base] + result
-            number //= base
-
-        return result or "0"
-
     # Encode first timestamp fully
-    result = compress_base62(timestamps[0])
+    parts = [_encode_base62(timestamps[0])]
     prev = timestamps[0]
+    prev_delta = 0
 
     # Add deltas for subsequent timestamps
     for timestamp in timestamps[1:]:
         delta = timestamp - prev
         prev = timestamp
 
-        # Encode delta in base62
-        delta_encoded = compress_base62(abs(delta))
+        if dod:
+            value = delta - prev_delta
+            prev_delta = delta
+        else:
+            value = delta
+
+        # Add sign, then the value in base62
+        parts.append('+' if value >= 0 else '-')
+        parts.append(_encode_base62(abs(value)))
+
+    return ''.join(parts)
+
+def compress_series_varint(timestamps):
+    """
+    Delta encoding for a series of timestamps using LEB128 varints.
+    The first timestamp and each subsequent delta are zigzag-mapped to unsigned
+    values (so small negative deltas stay small), written 7 bits per byte with
+    a continuation bit, and the whole byte string is base64 encoded once.
+
+    Args:
+        timestamps (list): Array of millisecond timestamps
+
+    Returns:
+        str: Base64 string of the varint byte stream
+    """
+    if len(timestamps) == 0:
+        return ''
+
+    out = bytearray()
+    prev = 0
+
+    for timestamp in timestamps:
+        delta = timestamp - prev
+        prev = timestamp
+
+        # Zigzag: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+        value = delta << 1 if delta >= 0 else (~delta << 1) | 1
+
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    return binascii.b2a_base64(out, newline=False).decode('ascii')
+
+@lru_cache(maxsize=None)
+def _scalar_encoder(chars):
+    """Uncached scalar encoder for an alphabet, used when NumPy is not available."""
+    return make_base_encoder(
+        f"_encode_base{len(chars)}", chars.decode('ascii'),
+        """Base-N encode one integer; zero and negatives encode as "0".""",
+        module=__name__
+    )
 
-        # Add sign for delta
-        sign_char = '+' if delta >= 0 else '-'
-        result += sign_char + delta_encoded
+@lru_cache(maxsize=None)
+def _load_numba_kernel():
+    """
+    Import the Numba batch kernel on first use, so scalar-only callers never
+    pay numba's import time. Returns None when Numba is not installed.
+    """
+    try:
+        from _encoders_numba import encode_batch
+    except ImportError:  # Numba is optional; batch helpers use the NumPy digit loop instead
+        return None
+    return encode_batch
+
+def compress_batch_baseN(arr, base, chars):
+    """
+    Base-N encode a whole batch of timestamps at once.
+    Uses the Numba kernel when available; otherwise digits are extracted column
+    by column with NumPy, so the interpreter runs one loop iteration per output
+    digit rather than per timestamp. Without NumPy each value goes through a
+    scalar encoder generated from the same template as the single-value ones.
+
+    Args:
+        arr (array-like): Integers (int64 range); zero and negatives encode as "0",
+                          like the scalar encoders
+        base (int): Target base, must equal len(chars)
+        chars (bytes): Alphabet used for the digits
+
+    Returns:
+        list: Encoded strings, one per input value
+
+    Raises:
+        ValueError: If base does not equal len(chars)
+    """
+    if base != len(chars):
+        raise ValueError(f"base {base} does not match the {len(chars)}-character alphabet")
+
+    if np is None:
+        encode = _scalar_encoder(chars)
+        return [encode(int(number)) for number in arr]
+
+    # Clamp so negatives take the zero path instead of producing wrapped digits
+    numbers = np.maximum(np.asarray(arr, dtype=np.int64), 0)
+    if numbers.size == 0:
+        return []
+
+    # Count digits with integer math; a float log can be off by one near powers of the base
+    max_digits = 1
+    limit = base
+    largest = int(numbers.max())
+    while largest >= limit:
+        max_digits += 1
+        limit *= base
+
+    chars_arr = np.frombuffer(chars, dtype=np.uint8)
+
+    encode_batch = _load_numba_kernel()
+    if encode_batch is not None:
+        out = np.zeros((len(numbers), max_digits), dtype=np.uint8)
+        lengths = np.empty(len(numbers), dtype=np.int64)
+        encode_batch(numbers, base, chars_arr, out, lengths)
+        encoded = out.tobytes().decode('ascii')
+        return [
+            encoded[(row + 1) * max_digits - length:(row + 1) * max_digits]
+            for row, length in enumerate(lengths.tolist())
+        ]
+
+    digits = np.zeros((len(numbers), max_digits), dtype=np.uint8)
+    n = numbers.copy()
+    for d in range(max_digits - 1, -1, -1):
+        digits[:, d] = n % base
+        n //= base
+
+    # Map digit values to ASCII and strip leading zeros (keeping one digit for zero)
+    encoded = chars_arr[digits].tobytes().decode('ascii')
+    first = np.argmax(digits != 0, axis=1)
+    first[numbers == 0] = max_digits - 1
+
+    return [
+        encoded[row * max_digits + start:(row + 1) * max_digits]
+        for row, start in enumerate(first.tolist())
+    ]
+
+def compress_millis_base36_batch(timestamps):
+    """Batch form of compress_millis_custom (base36)."""
+    return compress_batch_baseN(timestamps, 36, _CHARS36)
+
+def compress_millis_base62_batch(timestamps):
+    """Batch form of compress_millis_base62."""
+    return compress_batch_baseN(timestamps, 62, _CHARS62)
+
+def compress_millis_base94_batch(timestamps):
+    """Batch form of compress_millis_base94."""
+    return compress_batch_baseN(timestamps, len(_CHARS94), _CHARS94)
+
+def compress_millis_variable_batch(timestamps, reference_date=1577836800000):
+    """
+    Batch form of compress_millis_variable.
+
+    Args:
+        timestamps (array-like): Milliseconds since epoch
+        reference_date (int): Reference date in milliseconds
+
+    Returns:
+        list: Variable-length encoded strings
+    """
+    if np is None:
+        return [compress_millis_variable(t, reference_date) for t in timestamps]
+
+    millis = np.asarray(timestamps, dtype=np.int64)
+
+    # Near the int64 limits the subtraction or abs() would wrap, so keep those rows
+    # out of the vectorized path and encode them exactly with Python ints below
+    low = max(_INT64_MIN + 1 + reference_date, _INT64_MIN)
+    high = min(_INT64_MAX + reference_date, _INT64_MAX)
+    in_range = (millis >= low) & (millis <= high)
+
+    diffs = np.where(in_range, millis, reference_date) - reference_date
+    encoded = compress_batch_baseN(np.abs(diffs), 62, _CHARS62)
+    encoded = [
+        ('-' if negative else '+') + value
+        for negative, value in zip((diffs < 0).tolist(), encoded)
+    ]
+
+    for row in np.flatnonzero(~in_range).tolist():
+        encoded[row] = compress_millis_variable(int(millis[row]), reference_date)
+
+    return encoded
+
+def compress_split_days_time_batch(timestamps):
+    """
+    Batch form of compress_split_days_time.
+
+    Args:
+        timestamps (array-like): Milliseconds since epoch
+
+    Returns:
+        list: "days:time" strings with each component in base62
+    """
+    if np is None:
+        return [compress_split_days_time(t) for t in timestamps]
 
-    return result
+    days, ms_in_day = np.divmod(np.asarray(timestamps, dtype=np.int64), _MS_PER_DAY)
+
+    # Negative day counts encode as "0", matching the scalar encoder
+    days_encoded = compress_batch_baseN(np.maximum(days, 0), 62, _CHARS62)
+    time_encoded = compress_batch_baseN(ms_in_day, 62, _CHARS62)
+    return [d + ":" + t for d, t in zip(days_encoded, time_encoded)]
+
+def compress_millis_bit_packed_batch(timestamps):
+    """
+    Batch form of compress_millis_bit_packed.
+    All records are packed into one buffer and base64-encoded in a single call.
+    Each 6-byte record maps to exactly 8 base64 characters, so no padding
+    crosses record boundaries.
+
+    Args:
+        timestamps (array-like): Milliseconds since epoch
+
+    Returns:
+        list: Encoded strings; None where the day count does not fit in 16 bits
+              (the scalar encoder raises struct.error for those)
+    """
+    if np is None:
+        encoded = []
+        for timestamp in timestamps:
+            try:
+                encoded.append(compress_millis_bit_packed(timestamp))
+            except struct_error:
+                encoded.append(None)
+        return encoded
+
+    millis = np.asarray(timestamps, dtype=np.int64)
+    days, ms_in_day = np.divmod(millis, _MS_PER_DAY)
+    valid = (days >= 0) & (days <= 0xFFFF)
+
+    # Big-endian 16-bit days followed by big-endian 32-bit ms in day
+    packed = np.empty((len(millis), 6), dtype=np.uint8)
+    packed[:, :2] = days.astype('>u2').view(np.uint8).reshape(-1, 2)
+    packed[:, 2:] = ms_in_day.astype('>u4').view(np.uint8).reshape(-1, 4)
+
+    encoded = binascii.b2a_base64(packed.tobytes(), newline=False).decode('ascii')
+    return [
+        encoded[row * 8:(row + 1) * 8] if ok else None
+        for row, ok in enumerate(valid.tolist())
+    ]
+
+def compress_millis_base64url_batch(timestamps):
+    """
+    Batch form of compress_millis_base64url.
+
+    Args:
+        timestamps (array-like): Milliseconds since epoch
+
+    Returns:
+        list: 7-character strings; None where the timestamp does not fit in 42 bits
+              (the scalar encoder raises ValueError for those)
+    """
+    if np is None:
+        return [
+            compress_millis_base64url(t) if 0 <= t <= _MAX_42BIT else None
+            for t in timestamps
+        ]
+
+    millis = np.asarray(timestamps, dtype=np.int64)
+    valid = (millis >= 0) & (millis <= _MAX_42BIT)
+
+    # One column per 6-bit group, most significant first
+    shifts = np.arange(36, -1, -6, dtype=np.int64)
+    groups = (millis[:, None] >> shifts) & 0x3F
+    encoded = np.frombuffer(_B64URL, dtype=np.uint8)[groups].tobytes().decode('ascii')
+
+    return [
+        encoded[row * 7:(row + 1) * 7] if ok else None
+        for row, ok in enumerate(valid.tolist())
+    ]
+
+def decode_batch_base62(strs, width=None):
+    """
+    Decode a batch of base62 strings back to integers.
+    Strings are left-padded with "0" to a common width, mapped to digit values
+    through a 256-entry table in one lookup, and combined with a single
+    matrix product against the powers of 62.
+
+    Args:
+        strs (list): Base62 strings, as produced by compress_millis_base62
+        width (int): Padded width; defaults to the longest string
+
+    Returns:
+        ndarray: int64 values (a list of ints when NumPy is not available)
+
+    Raises:
+        ValueError: If a string is longer than width, contains characters outside
+            the base62 alphabet, or decodes to a value that does not fit in int64
+    """
+    longest = max((len(s) for s in strs), default=1)
+    if width is None:
+        width = longest
+    elif longest > width:
+        raise ValueError(f"width {width} is shorter than the longest string ({longest} chars)")
+
+    if np is None:
+        values = []
+        for s in strs:
+            value = 0
+            for b in s.encode('ascii'):
+                digit = _INV62[b]
+                if digit == 0xFF:
+                    raise ValueError(f"invalid base62 string: {s!r}")
+                value = value * 62 + digit
+            if value > _INT64_MAX:
+                raise ValueError(f"base62 string exceeds int64: {s!r}")
+            values.append(value)
+        return values
+
+    if not strs:
+        return np.zeros(0, dtype=np.int64)
+
+    buf = np.frombuffer(''.join(s.rjust(width, '0') for s in strs).encode('ascii'), dtype=np.uint8)
+    digits = _INV62_ARR[buf].reshape(len(strs), width)
+    if (digits == 0xFF).any():
+        raise ValueError("invalid base62 string in batch")
+
+    if width >= 11:
+        # 62**11 > 2**63, so the dot product would wrap; compare the low 11 digits
+        # against int64 max at the first column where they differ
+        diff = digits[:, -11:].astype(np.int16) - np.array(_INT64_MAX_DIGITS62, dtype=np.int16)
+        first = (diff != 0).argmax(axis=1)
+        if (digits[:, :-11] != 0).any() or (diff[np.arange(len(strs)), first] > 0).any():
+            raise ValueError("base62 string in batch exceeds int64")
+
+    powers = 62 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return digits.astype(np.int64) @ powers
 
 if __name__ == "__main__":
     # Example usage
@@ -155,7 +509,10 @@ if __name__ == "__main__":
     print(f"Base94: {compress_millis_base94(current_millis)}")
     print(f"Variable: {compress_millis_variable(current_millis)}")
     print(f"BitPacked: {compress_millis_bit_packed(current_millis)}")
+    print(f"Base64url (fixed 7): {compress_millis_base64url(current_millis)}")
 
     # Series example
     series = [current_millis, current_millis + 5000, current_millis + 12000]
     print(f"Series: {compress_timestamp_series(series)}")
+    print(f"Series (delta-of-delta): {compress_timestamp_series(series, dod=True)}")
+    print(f"Series (varint): {compress_series_varint(series)}")
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+"""
+Build script for the optional compiled encoders
+
+Usage:
+    python3 setup.py build_ext --inplace
+"""
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        "_fast_encode",
+        ["_fast_encode.pyx"],
+        extra_compile_args=["-O3", "-march=native"]
+    )
+]
+
+setup(
+    name="tz-compr",
+    ext_modules=cythonize(extensions)
+)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the encoders in enhanced_compression.py
+
+Run with:
+    python3 -m unittest test_enhanced_compression
+"""
+
+import base64
+import struct
+import unittest
+from unittest import mock
+
+import enhanced_compression
+from enhanced_compression import compress_millis_base94, compress_millis_base62_batch, compress_millis_base94_batch
+from enhanced_compression import compress_millis_variable, compress_millis_variable_batch
+from enhanced_compression import compress_millis_base64url, compress_millis_base64url_batch
+from enhanced_compression import compress_timestamp_series, compress_series_varint, decode_batch_base62
+from time_converter import compress_millis_base62
+
+# Negative (pre-1970) values mixed with a large one, so the digit width is > 1
+NEGATIVE_INPUTS = [-3, -1, 0, 10 ** 12, -86400000]
+# Values whose difference from the reference date does not fit in int64
+INT64_EDGE_INPUTS = [-2 ** 63, -2 ** 63 + 5, 2 ** 63 - 1, 0, 10 ** 12]
+
+class BatchNegativeInputTest(unittest.TestCase):
+    """Batch encoders must match the scalar encoders on negative input."""
+
+    def assert_matches_scalar(self):
+        self.assertEqual(
+            compress_millis_base62_batch(NEGATIVE_INPUTS),
+            [compress_millis_base62(t) for t in NEGATIVE_INPUTS]
+        )
+        self.assertEqual(
+            compress_millis_base94_batch(NEGATIVE_INPUTS),
+            [compress_millis_base94(t) for t in NEGATIVE_INPUTS]
+        )
+        self.assertEqual(
+            compress_millis_variable_batch(INT64_EDGE_INPUTS),
+            [compress_millis_variable(t) for t in INT64_EDGE_INPUTS]
+        )
+
+    @unittest.skipIf(enhanced_compression.np is None, "NumPy not installed")
+    def test_numpy_fallback(self):
+        with mock.patch.object(enhanced_compression, "_load_numba_kernel", return_value=None):
+            self.assert_matches_scalar()
+
+    @unittest.skipIf(enhanced_compression._load_numba_kernel() is None, "Numba not installed")
+    def test_numba_kernel(self):
+        self.assert_matches_scalar()
+
+    def test_without_numpy(self):
+        with mock.patch.object(enhanced_compression, "np", None):
+            self.assert_matches_scalar()
+
+    def test_base_must_match_alphabet(self):
+        for numpy in (enhanced_compression.np, None):
+            with mock.patch.object(enhanced_compression, "np", numpy):
+                with self.assertRaisesRegex(ValueError, "does not match"):
+                    enhanced_compression.compress_batch_baseN([1, 2], 10, enhanced_compression._CHARS62)
+
+class Base64urlTest(unittest.TestCase):
+    """The fixed-width encoder matches urlsafe_b64encode of the value left-aligned in 64 bits."""
+
+    VALUES = [0, 1, 63, 64, 1700000000000, 2 ** 42 - 1]
+    OUT_OF_RANGE = [-1, 2 ** 42, 2 ** 63 - 1]
+
+    def reference(self, value):
+        return base64.urlsafe_b64encode(struct.pack('>Q', value << 22))[:7].decode('ascii')
+
+    def test_scalar(self):
+        for value in self.VALUES:
+            self.assertEqual(compress_millis_base64url(value), self.reference(value))
+        for value in self.OUT_OF_RANGE:
+            with self.assertRaises(ValueError):
+                compress_millis_base64url(value)
+
+    def assert_batch(self):
+        self.assertEqual(
+            compress_millis_base64url_batch(self.VALUES + self.OUT_OF_RANGE),
+            [self.reference(value) for value in self.VALUES] + [None] * len(self.OUT_OF_RANGE)
+        )
+
+    @unittest.skipIf(enhanced_compression.np is None, "NumPy not installed")
+    def test_batch(self):
+        self.assert_batch()
+
+    def test_batch_without_numpy(self):
+        with mock.patch.object(enhanced_compression, "np", None):
+            self.assert_batch()
+
+class BitPackedBatchTest(unittest.TestCase):
+    """The bit-packed batch matches the scalar encoder, with None where it raises."""
+
+    MS_PER_DAY = 24 * 60 * 60 * 1000
+    # Last representable day, first day past 16 bits, and a pre-1970 timestamp
+    INPUTS = [0, 1700000000000, 0x10000 * MS_PER_DAY - 1, 0x10000 * MS_PER_DAY, -1]
+
+    def expected(self):
+        expected = []
+        for timestamp in self.INPUTS:
+            try:
+                expected.append(enhanced_compression.compress_millis_bit_packed(timestamp))
+            except struct.error:
+                expected.append(None)
+        return expected
+
+    def assert_matches_scalar(self):
+        expected = self.expected()
+        self.assertEqual(expected.count(None), 2)
+        self.assertEqual(enhanced_compression.compress_millis_bit_packed_batch(self.INPUTS), expected)
+
+    @unittest.skipIf(enhanced_compression.np is None, "NumPy not installed")
+    def test_numpy(self):
+        self.assert_matches_scalar()
+
+    def test_without_numpy(self):
+        with mock.patch.object(enhanced_compression, "np", None):
+            self.assert_matches_scalar()
+
+def decode_series_varint(encoded):
+    """Reference decoder for compress_series_varint: base64, LEB128, zigzag, then a running sum."""
+    timestamps = []
+    prev = value = shift = 0
+
+    for byte in base64.b64decode(encoded):
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte & 0x80:
+            continue
+
+        prev += (value >> 1) ^ -(value & 1)
+        timestamps.append(prev)
+        value = shift = 0
+
+    return timestamps
+
+class SeriesVarintTest(unittest.TestCase):
+    """compress_series_varint round-trips through a reference decoder."""
+
+    def test_round_trip(self):
+        series = [
+            [1672531200000],
+            [1672531200000, 1672531200005, 1672531200003, 1672531200003],
+            [0, -1, 1, -64, 64, 2 ** 62, -2 ** 62],
+            [1672531200000 + i * 4320000 for i in range(100)]
+        ]
+        for timestamps in series:
+            self.assertEqual(decode_series_varint(compress_series_varint(timestamps)), timestamps)
+
+    def test_small_deltas_take_one_byte(self):
+        # Zigzag keeps deltas in -64..63 to a single byte each
+        timestamps = [1672531200000, 1672531200063, 1672531199999]
+        encoded = base64.b64decode(compress_series_varint(timestamps))
+        self.assertEqual(len(encoded), len(base64.b64decode(compress_series_varint(timestamps[:1]))) + 2)
+
+@unittest.skipIf(enhanced_compression.np is None, "NumPy not installed")
+class SeriesArrayInputTest(unittest.TestCase):
+    """Series encoders accept NumPy arrays as well as lists."""
+
+    def test_array_matches_list(self):
+        series = [1672531200000 + i * 4320000 for i in range(5)]
+        array = enhanced_compression.np.array(series, dtype=enhanced_compression.np.int64)
+
+        self.assertEqual(compress_timestamp_series(array), compress_timestamp_series(series))
+        self.assertEqual(compress_timestamp_series(array, dod=True), compress_timestamp_series(series, dod=True))
+        self.assertEqual(compress_series_varint(array), compress_series_varint(series))
+
+    def test_empty_array(self):
+        empty = enhanced_compression.np.array([], dtype=enhanced_compression.np.int64)
+
+        self.assertEqual(compress_timestamp_series(empty), '')
+        self.assertEqual(compress_series_varint(empty), '')
+
+class DecodeBatchBase62Test(unittest.TestCase):
+    """The NumPy and pure-Python decoders validate their input the same way."""
+
+    def assert_validates(self):
+        self.assertEqual(list(decode_batch_base62(["aZl8N0y58M7", "00", "1a"], width=13)), [2 ** 63 - 1, 0, 72])
+        with self.assertRaisesRegex(ValueError, "width 2"):
+            decode_batch_base62(["abc"], width=2)
+        with self.assertRaisesRegex(ValueError, "int64"):
+            decode_batch_base62(["aZl8N0y58M8"])
+        with self.assertRaisesRegex(ValueError, "int64"):
+            decode_batch_base62(["10000000000000"])
+
+    @unittest.skipIf(enhanced_compression.np is None, "NumPy not installed")
+    def test_numpy(self):
+        self.assert_validates()
+
+    def test_without_numpy(self):
+        with mock.patch.object(enhanced_compression, "np", None):
+            self.assert_validates()
+
+if __name__ == "__main__":
+    unittest.main()